@@ -6,16 +6,13 @@ import logging
 import sys
 import os
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from itertools import count, groupby
-import copy
-
-from dateutil import rrule
 
 from clients.recreation_client import RecreationClient
 from enums.date_format import DateFormat
 from enums.emoji import Emoji
-from utils import formatter
+from utils import api_cache, formatter
 from utils.camping_argparser import CampingArgumentParser
 
 LOG = logging.getLogger(__name__)
@@ -26,6 +23,29 @@ sh = logging.StreamHandler()
 sh.setFormatter(log_formatter)
 LOG.addHandler(sh)
 
+# The work is network-bound, so a handful of threads is enough to overlap the
+# round trips without hammering recreation.gov. Parks are checked concurrently,
+# months within a park serially, so one worker per pooled connection.
+MAX_WORKERS = RecreationClient.MAX_CONNECTIONS
+
+# site fields copied to the output, "na" when the API didn't provide them.
+# Shared with api_cache so the projected responses always carry them.
+SITE_INFO_FIELDS = api_cache.SITE_INFO_FIELDS
+
+
+def month_firsts(start_date, end_date):
+    """
+    Yields the first of each month from the month of `start_date` up to and
+    including the month of `end_date`.
+    """
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        yield datetime(year, month, 1)
+        month += 1
+        if month == 13:
+            month = 1
+            year += 1
+
 
 def get_park_information(
     park_id, start_date, end_date, campsite_type=None, campsite_ids=()
@@ -52,52 +72,52 @@ def get_park_information(
     the script doesn't need to know this to determine whether sites are available.
     """
 
+    campsite_ids = frozenset(int(x) for x in campsite_ids)
+
     # Get each first of the month for months in the range we care about.
-    start_of_month = datetime(start_date.year, start_date.month, 1)
-    months = list(
-        rrule.rrule(rrule.MONTHLY, dtstart=start_of_month, until=end_date)
-    )
+    months = list(month_firsts(start_date, end_date))
 
-    # Get data for each month.
-    api_data = []
-    for month_date in months:
-        api_data.append(RecreationClient.get_availability(park_id, month_date))
+    # Get data for each month. The months are fetched one after the other,
+    # the concurrency lives at the park level in main.
+    api_data = [
+        api_cache.get_availability(park_id, month_date) for month_date in months
+    ]
 
     # Collapse the data into the described output format.
     # Filter by campsite_type if necessary.
     data = {}
-    data2 = {} # additional information on the campsite, excluding "availabilities"
+    data2 = {} # additional information on the campsite, excluding "availabilities", keyed by int id
 
     for month_data in api_data:
         for campsite_id, campsite_data in month_data["campsites"].items():
-            LOG.debug("campsite_data="+json.dumps(campsite_data))
-            available = []
+            if LOG.isEnabledFor(logging.DEBUG):
+                LOG.debug("campsite_data=%s", json.dumps(campsite_data))
+            # get the SITE_INFO_FIELDS of the campsite the first time it shows up.
+            # A shallow copy is enough, nothing downstream mutates these values.
+            if campsite_id not in data:
+                data2[int(campsite_id)] = {
+                    k: campsite_data[k]
+                    for k in SITE_INFO_FIELDS
+                    if k in campsite_data
+                }
             a = data.setdefault(campsite_id, [])
 
-            # get addition campsite data, excluding "availabilities" and "quantities"
-            campsite_info=copy.deepcopy(campsite_data)
-            campsite_info.pop('availabilities', None)
-            campsite_info.pop('quantities', None)
-            campsite_info.pop('campsite_id', None)
-            data2.setdefault(campsite_id, campsite_info)
-
-            for date, availability_value in campsite_data["availabilities"].items():
-                if availability_value != "Available":
-                    continue
-
-                if (
-                    campsite_type
-                    and campsite_type != campsite_data["campsite_type"]
-                ):
-                    continue
-
-                if (
-                    len(campsite_ids) > 0
-                    and int(campsite_data["campsite_id"]) not in campsite_ids
-                ):
-                    continue
-
-                available.append(date)
+            # The filters only depend on the campsite, so check them once
+            # rather than for every date.
+            if campsite_type and campsite_type != campsite_data["campsite_type"]:
+                continue
+
+            if (
+                campsite_ids
+                and int(campsite_data["campsite_id"]) not in campsite_ids
+            ):
+                continue
+
+            available = [
+                date
+                for date, availability_value in campsite_data["availabilities"].items()
+                if availability_value == "Available"
+            ]
             if available:
                 a += available
     # print('\ndata=')
@@ -124,17 +144,13 @@ def get_num_available_sites(
 
     if nights not in range(1, num_days + 1):
         nights = num_days
-        LOG.debug("Setting number of nights to {}.".format(nights))
+        LOG.debug("Setting number of nights to %s.", nights)
 
     available_dates_by_campsite_id = defaultdict(list)
     for site, availabilities in park_information.items():
-        # List of dates that are in the desired range for this site.
-        desired_available = []
-
-        for date in availabilities:
-            if date not in dates:
-                continue
-            desired_available.append(date)
+        # Dates that are in the desired range for this site. Ordering and
+        # duplicates are left to consecutive_nights.
+        desired_available = dates.intersection(availabilities)
 
         if not desired_available:
             continue
@@ -145,12 +161,11 @@ def get_num_available_sites(
 
         if appropriate_consecutive_ranges:
             num_available += 1
-            LOG.debug("Available site {}: {}".format(num_available, site))
+            LOG.debug("Available site %s: %s", num_available, site)
 
-        for r in appropriate_consecutive_ranges:
-            start, end = r
-            available_dates_by_campsite_id[int(site)].append(
-                {"start": start, "end": end}
+            # ranges are kept as the (start, end) tuples consecutive_nights returns
+            available_dates_by_campsite_id[int(site)].extend(
+                appropriate_consecutive_ranges
             )
 
     return num_available, maximum, available_dates_by_campsite_id
@@ -163,19 +178,23 @@ def consecutive_nights(available, nights):
 
     If there is one or more entries in this list, there is at least one
     date range for this site that is available.
-    """
-    ordinal_dates = [
-        datetime.strptime(
-            dstr, DateFormat.ISO_DATE_FORMAT_RESPONSE.value
-        ).toordinal()
-        for dstr in available
-    ]
-    c = count()
 
-    consecutive_ranges = list(
-        list(g) for _, g in groupby(ordinal_dates, lambda x: x - next(c))
+    `available` doesn't need to be sorted and may contain duplicates.
+    """
+    # The API dates look like "2022-06-22T00:00:00Z"; the date part is plain
+    # ISO 8601, which fromisoformat parses much faster than strptime.
+    ordinal_dates = sorted(
+        set(datetime.fromisoformat(dstr[:10]).toordinal() for dstr in available)
     )
 
+    # Split the sorted ordinals into runs of consecutive days.
+    consecutive_ranges = []
+    for ordinal in ordinal_dates:
+        if consecutive_ranges and ordinal == consecutive_ranges[-1][-1] + 1:
+            consecutive_ranges[-1].append(ordinal)
+        else:
+            consecutive_ranges.append([ordinal])
+
     long_enough_consecutive_ranges = []
     for r in consecutive_ranges:
         # Skip ranges that are too short.
@@ -199,12 +218,14 @@ def check_park(park_id, start_date, end_date, campsite_type, campsite_ids=(), ni
     park_information, park_additional_information = get_park_information(
         park_id, start_date, end_date, campsite_type, campsite_ids
     )
-    LOG.debug(
-        "Information for park {}: {}".format(
-            park_id, json.dumps(park_information, indent=2)
+    # json.dumps of the whole park is expensive, only do it when it's logged
+    if LOG.isEnabledFor(logging.DEBUG):
+        LOG.debug(
+            "Information for park %s: %s",
+            park_id,
+            json.dumps(park_information, indent=2),
         )
-    )
-    park_name = RecreationClient.get_park_name(park_id)
+    park_name = api_cache.get_park_name(park_id)
     current, maximum, availabilities_filtered = get_num_available_sites(
         park_information, start_date, end_date, nights=nights
     )
@@ -274,23 +295,14 @@ def check_park(park_id, start_date, end_date, campsite_type, campsite_ids=(), ni
 #     return json.dumps(availabilities_by_park_id), has_availabilities
 
 
-def getSiteInformation(info_by_site_id, site_id):
-    # print("\ninfo_by_site_id=")
-    # print(info_by_site_id)
-    site_info=info_by_site_id[str(site_id)]
-    return site_info
-
 def generate_site_info_html(site_info):
-    html=""
-    # site
-    # if "site" in site_info: html+=f" Site={site_info['site']}"
-    # else: html+=f" Site=na"
-    html+= " site=" + (site_info['site'] if ("site" in site_info) else "na")
-    html+= " " + (site_info['loop'] if ("loop" in site_info) else "na")
-    html+= ", max people=" + (str(site_info['max_num_people']) if ("max_num_people" in site_info) else "na")
-    html+= ", capacity=" + (site_info['capacity_rating'] if ("capacity_rating" in site_info) else "na")
-    html+= ", type=" + (site_info['campsite_type'] if ("campsite_type" in site_info) else "na")
-    return html
+    g=site_info.get
+    return (
+        f" site={g('site', 'na')} {g('loop', 'na')}"
+        f", max people={g('max_num_people', 'na')}"
+        f", capacity={g('capacity_rating', 'na')}"
+        f", type={g('campsite_type', 'na')}"
+    )
 
 
 def getOutputData(info_by_park_id):
@@ -306,15 +318,11 @@ def getOutputData(info_by_park_id):
             "available_sites":[]
             }
         for site_id, dates in available_dates_by_site_id.items():
-            site_info=getSiteInformation(info_by_site_id, site_id)
-            siteData={"site_id":site_id}
-            siteData['site']=(site_info['site'] if ("site" in site_info) else "na")
-            siteData['loop']=(site_info['loop'] if ("loop" in site_info) else "na")
-            siteData['max_num_people']=(site_info['max_num_people'] if ("max_num_people" in site_info) else "na")
-            siteData['capacity_rating']=(site_info['capacity_rating'] if ("capacity_rating" in site_info) else "na")
-            siteData['campsite_type']=(site_info['campsite_type'] if ("campsite_type" in site_info) else "na")
+            site_info=info_by_site_id[site_id]
+            siteData={"site_id":site_id, **{f: site_info.get(f, "na") for f in SITE_INFO_FIELDS}}
             campgroundData['available_sites'].append(siteData)
-        campgroundData['available_sites'] = sorted(campgroundData['available_sites'], key=lambda k: (k['loop'].lower(), k['site']))
+        # the key function runs once per site, sorting in place avoids a copy
+        campgroundData['available_sites'].sort(key=lambda k: (k['loop'].lower(), k['site']))
         outputData.append(campgroundData)
         
         # need to sort 'available_sites" based on loop and site
@@ -360,33 +368,29 @@ def getOutputData(info_by_park_id):
 
 
 def generate_html_output(data, params):
-    html_prefix="<html><head></head><body>"
-    html_suffix="</body></html>"
-    html=""
-
     startDateTxt=params['start_date'].strftime("%a %b %d, %Y") 
     endDateTxt=params['end_date'].strftime("%a %b %d, %Y") 
 
-    html=f"Campsites for {startDateTxt} to {endDateTxt}"
-    html+="<br>"
+    # collect the pieces and join once at the end instead of repeated +=
+    parts=["<html><head></head><body>", f"Campsites for {startDateTxt} to {endDateTxt}<br>"]
     for park in data:
-        html+="<p>"
-        html+=f"{park['park_name']} <a href='https://www.recreation.gov/camping/campgrounds/{park['park_id']}' target=_blank>recreation.gov</a>"
-        html+=f"<br>{park['available_sites_count']} sites available out of {park['total_sites_count']}"
-        html+="<br>"
+        parts.append(
+            f"<p>{park['park_name']} <a href='https://www.recreation.gov/camping/campgrounds/{park['park_id']}' target=_blank>recreation.gov</a>"
+            f"<br>{park['available_sites_count']} sites available out of {park['total_sites_count']}<br>"
+        )
 
         for site in park['available_sites']:
-            html+=f"<a href='https://www.recreation.gov/camping/campsites/{site['site_id']}' target=_blank>{site['site_id']}</a>"
-            html+=f" site={site['loop']} {site['site']}"
-            html+=f", max people={site['max_num_people']}"
-            html+=f", capacity={site['capacity_rating']}"
-            html+=f", type={site['campsite_type']}"
-            html+="<br>"
-        html+="</p>"
-
+            parts.append(
+                f"<a href='https://www.recreation.gov/camping/campsites/{site['site_id']}' target=_blank>{site['site_id']}</a>"
+                f" site={site['loop']} {site['site']}"
+                f", max people={site['max_num_people']}"
+                f", capacity={site['capacity_rating']}"
+                f", type={site['campsite_type']}<br>"
+            )
+        parts.append("</p>")
 
-    html=html_prefix+html+html_suffix
-    return html
+    parts.append("</body></html>")
+    return "".join(parts)
         
 
 
@@ -399,24 +403,29 @@ def main():   # parks, json_output=False
 
 
     if os.path.isfile(paramsFile):
-        paramsTxt=open(paramsFile).read()
-        params=json.loads(paramsTxt)
+        with open(paramsFile, 'rb') as infile:
+            params=json.load(infile)
         params['start_date']=datetime.strptime(params['start_date'], '%Y-%m-%d')
         params['end_date']=datetime.strptime(params['end_date'], '%Y-%m-%d')
     
     print(f"params={params}")
     print('\n')
     
-    info_by_park_id = {}
-    for park_i in params['parks']:
-        if park_i['check']:
-            info_by_park_id[park_i['id']] = check_park(
-                park_i['id'],
+    park_ids = [park_i['id'] for park_i in params['parks'] if park_i['check']]
+
+    # check the parks concurrently; executor.map keeps the config order
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = executor.map(
+            lambda park_id: check_park(
+                park_id,
                 params['start_date'],
                 params['end_date'],
                 '',
                 '',
-            )
+            ),
+            park_ids,
+        )
+        info_by_park_id = dict(zip(park_ids, results))
  
     # restruct data to a JSON
     outputData=getOutputData(info_by_park_id)
@@ -1,6 +1,7 @@
 import logging
 
 import requests
+from requests.adapters import HTTPAdapter
 import user_agent 
 
 from utils import formatter
@@ -17,13 +18,18 @@ class RecreationClient:
     MAIN_PAGE_ENDPOINT = BASE_URL + "/api/camps/campgrounds/{park_id}"
 
     headers = {"User-Agent": user_agent.generate_user_agent() }
-    
+
+    # Size of the shared connection pool, also the checker's worker count.
+    MAX_CONNECTIONS = 8
+
+    # Shared session so connections are kept alive and reused across requests.
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_maxsize=MAX_CONNECTIONS))
+
     @classmethod
     def get_availability(cls, park_id, month_date):
         params = {"start_date": formatter.format_date(month_date)}
-        LOG.debug(
-            "Querying for {} with these params: {}".format(park_id, params)
-        )
+        LOG.debug("Querying for %s with these params: %s", park_id, params)
         url = cls.AVAILABILITY_ENDPOINT.format(park_id=park_id)
         resp = cls._send_request(url, params)
         return resp
@@ -37,7 +43,7 @@ class RecreationClient:
 
     @classmethod
     def _send_request(cls, url, params):
-        resp = requests.get(url, params=params, headers=cls.headers)
+        resp = cls.session.get(url, params=params, headers=cls.headers)
         if resp.status_code != 200:
             raise RuntimeError(
                 "failedRequest",
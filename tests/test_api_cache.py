@@ -0,0 +1,113 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from utils import api_cache
+
+
+class TestApiCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        db_file = os.path.join(self.tmp_dir.name, "availability.sqlite")
+        self.park_names_file = os.path.join(self.tmp_dir.name, "park_names.json")
+        for patcher in (
+            mock.patch.object(api_cache, "AVAILABILITY_DB_FILE", db_file),
+            mock.patch.object(api_cache, "PARK_NAMES_FILE", self.park_names_file),
+            mock.patch.object(api_cache, "_park_names", {}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        client_patcher = mock.patch.object(api_cache, "RecreationClient")
+        self.client = client_patcher.start()
+        self.addCleanup(client_patcher.stop)
+
+        api_cache.get_availability.cache_clear()
+        api_cache.get_park_name.cache_clear()
+        self.addCleanup(api_cache.get_availability.cache_clear)
+        self.addCleanup(api_cache.get_park_name.cache_clear)
+
+        self.month = datetime(2022, 6, 1)
+        self.client.get_availability.return_value = {
+            "campsites": {
+                "1": {
+                    "campsite_id": "1",
+                    "site": "001",
+                    "quantities": {},
+                    "availabilities": {"2022-06-22T00:00:00Z": "Available"},
+                }
+            },
+            "count": 1,
+        }
+
+    def testGetAvailability_FreshEntryIsServedFromDisk(self):
+        with mock.patch.object(api_cache.time, "time", return_value=1000):
+            first = api_cache.get_availability(10, self.month)
+        api_cache.get_availability.cache_clear()
+        with mock.patch.object(api_cache.time, "time", return_value=1060):
+            second = api_cache.get_availability(10, self.month)
+
+        self.assertEqual(self.client.get_availability.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(
+            first,
+            {
+                "campsites": {
+                    "1": {
+                        "campsite_id": "1",
+                        "site": "001",
+                        "availabilities": {"2022-06-22T00:00:00Z": "Available"},
+                    }
+                }
+            },
+        )
+
+    def testGetAvailability_ExpiredEntryIsFetchedAgain(self):
+        with mock.patch.object(api_cache.time, "time", return_value=1000):
+            api_cache.get_availability(10, self.month)
+        api_cache.get_availability.cache_clear()
+        with mock.patch.object(
+            api_cache.time,
+            "time",
+            return_value=1000 + api_cache.AVAILABILITY_TTL,
+        ):
+            api_cache.get_availability(10, self.month)
+
+        self.assertEqual(self.client.get_availability.call_count, 2)
+
+    def testGetParkName_MissFetchesAndWritesFile(self):
+        self.client.get_park_name.return_value = "SOME PARK"
+
+        with mock.patch.object(api_cache.time, "time", return_value=1000):
+            name = api_cache.get_park_name(10)
+
+        self.assertEqual(name, "SOME PARK")
+        self.client.get_park_name.assert_called_once_with(10)
+        with open(self.park_names_file) as infile:
+            self.assertEqual(
+                json.load(infile), {"10": {"name": "SOME PARK", "fetched_at": 1000}}
+            )
+
+    def testLoadParkNames_TruncatedFileIsTreatedAsEmpty(self):
+        with open(self.park_names_file, "w") as outfile:
+            outfile.write('{"10": {"name": "SOME')
+
+        self.assertEqual(api_cache._load_park_names(), {})
+
+    def testGetAvailability_BrokenDatabaseFallsBackToClient(self):
+        with open(api_cache.AVAILABILITY_DB_FILE, "w") as outfile:
+            outfile.write("not a database")
+
+        month_data = api_cache.get_availability(10, self.month)
+
+        self.client.get_availability.assert_called_once_with(10, self.month)
+        self.assertIn("1", month_data["campsites"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from datetime import datetime
+
+import check_rec_gov
+
+
+class TestCheckRecGov(unittest.TestCase):
+    def testMonthFirsts_RollsOverIntoNextYear(self):
+        months = list(
+            check_rec_gov.month_firsts(datetime(2022, 12, 20), datetime(2023, 1, 5))
+        )
+
+        self.assertEqual(months, [datetime(2022, 12, 1), datetime(2023, 1, 1)])
+
+    def testConsecutiveNights_HandlesUnsortedAndDuplicateDates(self):
+        available = [
+            "2022-06-23T00:00:00Z",
+            "2022-06-26T00:00:00Z",
+            "2022-06-22T00:00:00Z",
+            "2022-06-23T00:00:00Z",
+            "2022-06-24T00:00:00Z",
+        ]
+
+        ranges = check_rec_gov.consecutive_nights(available, 2)
+
+        self.assertEqual(
+            ranges,
+            [("2022-06-22", "2022-06-24"), ("2022-06-23", "2022-06-25")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
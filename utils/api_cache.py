@@ -0,0 +1,146 @@
+import functools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from clients.recreation_client import RecreationClient
+from utils import formatter
+
+LOG = logging.getLogger(__name__)
+
+AVAILABILITY_DB_FILE = "availability_cache.sqlite"
+PARK_NAMES_FILE = "park_names.json"
+
+# Availability changes constantly, park names practically never.
+AVAILABILITY_TTL = 10 * 60
+PARK_NAME_TTL = 30 * 24 * 60 * 60
+
+# site fields shown in the checker's output
+SITE_INFO_FIELDS = ("site", "loop", "max_num_people", "capacity_rating", "campsite_type")
+
+# the only keys of the API campsite data the checker looks at
+CAMPSITE_KEYS = ("campsite_id", "availabilities") + SITE_INFO_FIELDS
+
+_park_names_lock = threading.Lock()
+
+
+def _connect():
+    # one connection per call keeps this safe to use from worker threads
+    conn = sqlite3.connect(AVAILABILITY_DB_FILE)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS availability ("
+        "park_id TEXT, month TEXT, fetched_at INT, json TEXT, "
+        "PRIMARY KEY (park_id, month))"
+    )
+    return conn
+
+
+def _load_park_names():
+    # a missing or unreadable file just means starting with an empty cache
+    try:
+        with open(PARK_NAMES_FILE) as infile:
+            return json.load(infile)
+    except (OSError, ValueError):
+        return {}
+
+
+_park_names = _load_park_names()
+
+
+def _project(month_data):
+    # keep only the campsite fields we use so the full response can be dropped
+    return {
+        "campsites": {
+            campsite_id: {
+                k: campsite_data[k] for k in CAMPSITE_KEYS if k in campsite_data
+            }
+            for campsite_id, campsite_data in month_data["campsites"].items()
+        }
+    }
+
+
+# The on-disk cache is best-effort: a broken, locked or read-only database
+# just means going to the API.
+def _lookup(key, now):
+    try:
+        conn = _connect()
+        try:
+            row = conn.execute(
+                "SELECT fetched_at, json FROM availability "
+                "WHERE park_id = ? AND month = ?",
+                key,
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        LOG.debug("Availability cache lookup failed for %s: %s", key, e)
+        return None
+    if row and now - row[0] < AVAILABILITY_TTL:
+        return json.loads(row[1])
+    return None
+
+
+def _store(key, now, resp):
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO availability VALUES (?, ?, ?, ?)",
+                    key + (now, json.dumps(resp)),
+                )
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        LOG.debug("Availability cache store failed for %s: %s", key, e)
+
+
+@functools.lru_cache(maxsize=1024)
+def get_availability(park_id, month_date):
+    """
+    Same as RecreationClient.get_availability, but with each campsite cut
+    down to CAMPSITE_KEYS, and answered from the on-disk cache when the
+    stored response is younger than AVAILABILITY_TTL.
+    """
+    key = (str(park_id), formatter.format_date(month_date))
+    now = int(time.time())
+
+    cached = _lookup(key, now)
+    if cached is not None:
+        LOG.debug("Availability cache hit for %s", key)
+        return cached
+
+    resp = RecreationClient.get_availability(park_id, month_date)
+    if LOG.isEnabledFor(logging.DEBUG):
+        LOG.debug("Availability for %s: %s", key, json.dumps(resp))
+    resp = _project(resp)
+    _store(key, now, resp)
+    return resp
+
+
+@functools.lru_cache(maxsize=256)
+def get_park_name(park_id):
+    """
+    Same as RecreationClient.get_park_name, backed by a write-through JSON
+    file of names fetched within the last PARK_NAME_TTL.
+    """
+    key = str(park_id)
+    now = int(time.time())
+
+    entry = _park_names.get(key)
+    if entry and now - entry["fetched_at"] < PARK_NAME_TTL:
+        return entry["name"]
+
+    name = RecreationClient.get_park_name(park_id)
+    with _park_names_lock:
+        _park_names[key] = {"name": name, "fetched_at": now}
+        # write a temp file and swap it in so a killed run can't leave a
+        # truncated file behind
+        tmp_file = PARK_NAMES_FILE + ".tmp"
+        with open(tmp_file, "w") as outfile:
+            json.dump(_park_names, outfile, indent=2)
+        os.replace(tmp_file, PARK_NAMES_FILE)
+    return name